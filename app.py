@@ -1,23 +1,129 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
+import queue
 import subprocess
-import json
+import threading
+import time
+import orjson
+
+from config import Config
 
 app = Flask(__name__)
 
+
+def json_response(body, status=200):
+    """Build a JSON response from an object or already-serialized JSON."""
+    if not isinstance(body, (bytes, str)):
+        body = orjson.dumps(body)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def parse_json():
+    """Parse the request body with orjson, returning None for an empty body."""
+    buf = request.get_data(cache=False)
+    return orjson.loads(buf) if buf else None
+
+
+class MCPServerError(Exception):
+    """The MCP server exited or wrote something that is not a JSON-RPC message."""
+
+
+# Command that starts the MCP server
+MCP_COMMAND = ['python', '-m', 'mcp_server_servicenow.cli']
+
+# Long-lived MCP server process shared by every request; MCP stdio is a
+# single stream, so requests take turns on it
+mcp_proc = None
+mcp_lock = threading.Lock()
+
+# Lines from mcp_proc's stdout, queued by a reader thread so reads can time out
+mcp_lines = None
+
+
+def read_lines(stream, lines):
+    """Queue each line the MCP server writes, then None once it exits."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def get_mcp_proc():
+    """Get the MCP server process, (re)starting it if it is not running."""
+    global mcp_proc, mcp_lines
+    if mcp_proc is None or mcp_proc.poll() is not None:
+        mcp_proc = subprocess.Popen(
+            MCP_COMMAND,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        mcp_lines = queue.Queue()
+        threading.Thread(
+            target=read_lines, args=(mcp_proc.stdout, mcp_lines), daemon=True
+        ).start()
+    return mcp_proc
+
+
+def kill_mcp_proc():
+    """Kill a misbehaving MCP server so the next request starts a fresh one."""
+    global mcp_proc
+    if mcp_proc is not None:
+        mcp_proc.kill()
+        mcp_proc.wait()
+        mcp_proc = None
+
+
+def read_reply(request_id, timeout):
+    """Read lines until the reply to request_id arrives, raising TimeoutError after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    # Skip any server-initiated messages until our reply arrives
+    while True:
+        try:
+            line = mcp_lines.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            raise TimeoutError(f"MCP server did not reply within {timeout}s")
+        if line is None:
+            raise MCPServerError("MCP server exited unexpectedly")
+        try:
+            message = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            raise MCPServerError(f"MCP server wrote invalid output: {line.strip()[:200]}")
+        if isinstance(message, dict) and message.get("id") == request_id:
+            return line
+
+
 @app.route('/mcp', methods=['POST'])
 def mcp_endpoint():
     try:
-        data = request.get_json()
-        # Pass request to MCP server
-        result = subprocess.run(
-            ['python', '-m', 'mcp_server_servicenow.cli'],
-            input=json.dumps(data),
-            capture_output=True,
-            text=True
-        )
-        return jsonify(json.loads(result.stdout))
+        data = parse_json()
+    except orjson.JSONDecodeError:
+        return json_response({"error": "invalid json"}, 400)
+    if not data:
+        return json_response({"error": "No JSON data provided"}, 400)
+    if not isinstance(data, dict):
+        return json_response({"error": "JSON body must be an object"}, 400)
+    
+    try:
+        with mcp_lock:
+            proc = get_mcp_proc()
+            proc.stdin.write(orjson.dumps(data).decode() + "\n")
+            proc.stdin.flush()
+            # Notifications have no id and get no reply
+            if "id" not in data:
+                return json_response({}, 202)
+            try:
+                line = read_reply(data["id"], Config.REQUEST_TIMEOUT)
+            except (TimeoutError, MCPServerError):
+                kill_mcp_proc()
+                raise
+        # Relay the server's reply as-is rather than re-serializing it
+        return json_response(line)
+    except TimeoutError as e:
+        return json_response({"error": str(e)}, 504)
+    except MCPServerError as e:
+        return json_response({"error": str(e)}, 502)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=8000)
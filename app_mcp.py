@@ -3,24 +3,38 @@ MCP-over-HTTP Bridge for ServiceNow MCP Server
 This creates a proper HTTP bridge for the MCP protocol.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request
 import asyncio
+import concurrent.futures
+import functools
+import atexit
+import hashlib
+import importlib.util
 import json
 import os
 import logging
-from typing import Dict, Any
+import re
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional
 import sys
 
+import httpx
+import orjson
+from cachetools import TTLCache
+
 # Add the mcp_server_servicenow to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-    MCP_AVAILABLE = True
-except ImportError:
-    MCP_AVAILABLE = False
-    logging.warning("MCP library not available, using fallback mode")
+from config import Config
+from mcp_server_servicenow.circuit import CircuitBreaker, CircuitOpenError
+from mcp_server_servicenow.errors import (
+    SERVICENOW_TIMEOUT, SERVICENOW_UNAVAILABLE, ServiceNowTimeoutError
+)
+from mcp_server_servicenow.metrics import (
+    CACHE_REQUESTS, HTTP_LATENCY, METRICS_AVAILABLE, UPSTREAM_INFLIGHT, UPSTREAM_LATENCY,
+    render_latest
+)
 
 app = Flask(__name__)
 
@@ -32,6 +46,59 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Serialize MCP result models, which orjson does not handle natively."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_response(obj, status: int = 200):
+    """Build a JSON response from an object or already-serialized JSON bytes."""
+    if not isinstance(obj, bytes):
+        obj = orjson.dumps(obj, default=_json_default)
+    return app.response_class(obj, status=status, mimetype='application/json')
+
+
+@functools.lru_cache(maxsize=None)
+def mcp_available() -> bool:
+    """Check whether the MCP library is installed without importing it."""
+    # The mcp client is only imported by MCPBridge, so workers that never
+    # serve an MCP call do not pay for it
+    available = importlib.util.find_spec("mcp") is not None
+    if not available:
+        logger.warning("MCP library not available, using fallback mode")
+    return available
+
+
+def parse_json():
+    """Parse the request body with orjson, returning None for an empty body.
+    
+    Raises orjson.JSONDecodeError for a malformed body.
+    """
+    buf = request.get_data(cache=False)
+    return orjson.loads(buf) if buf else None
+
+
+class ServiceNowUnavailableError(Exception):
+    """The MCP server reported that ServiceNow calls are being short-circuited."""
+
+
+def raise_for_servicenow_error(message: str):
+    """Raise the matching bridge exception if an MCP error message reports a ServiceNow failure."""
+    if SERVICENOW_UNAVAILABLE in message:
+        raise ServiceNowUnavailableError(message)
+    if SERVICENOW_TIMEOUT in message:
+        raise ServiceNowTimeoutError(message)
+
+
+# MCP resource reporting the ServiceNow client's response cache stats
+CLIENT_CACHE_STATS_URI = "servicenow://stats/cache"
+
+# MCP methods whose results only change when the server is redeployed
+CACHEABLE_METHODS = frozenset({"list_tools", "list_resources"})
+
+
 class MCPBridge:
     """Bridge between HTTP requests and MCP server."""
     
@@ -42,12 +109,16 @@ class MCPBridge:
         
         if not all([self.instance_url, self.username, self.password]):
             raise ValueError("Missing ServiceNow credentials in environment variables")
-    
-    async def call_mcp_server(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Call the MCP server with given method and parameters."""
         
-        # Create server parameters
-        server_params = StdioServerParameters(
+        import anyio
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+        self.client_session = ClientSession
+        self.stdio_client = stdio_client
+        # Raised once the MCP server process has gone away
+        self.session_errors = (BrokenPipeError, anyio.ClosedResourceError, anyio.BrokenResourceError)
+        
+        self.server_params = StdioServerParameters(
             command="python",
             args=[
                 "-m", "mcp_server_servicenow.cli",
@@ -56,98 +127,520 @@ class MCPBridge:
                 "--password", self.password
             ],
             env={
-                **os.environ,
+                # Every worker starts its own server, so they cannot all bind one
+                # metrics port; set PROMETHEUS_MULTIPROC_DIR to collect their metrics
+                **{k: v for k, v in os.environ.items() if k != "SERVICENOW_METRICS_PORT"},
                 "SERVICENOW_INSTANCE_URL": self.instance_url,
                 "SERVICENOW_USERNAME": self.username,
                 "SERVICENOW_PASSWORD": self.password
             }
         )
         
+        # Only touched from the bridge event loop, so no lock is needed
+        self.cache = TTLCache(maxsize=2048, ttl=30)
+        self.cache_stats = {"hits": 0, "misses": 0}
+        
+        # Long-lived MCP session, see get_session()
+        self._session = None
+        self._session_task = None
+        self._session_lock = None
+        self._closed = None
+    
+    async def __aenter__(self):
+        await self.get_session()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def get_session(self) -> "ClientSession":
+        """Get the MCP session, starting and initializing the server on first use."""
+        # Created here rather than in __init__ so it binds to the running loop
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        
+        async with self._session_lock:
+            if self._session is None:
+                ready = asyncio.get_running_loop().create_future()
+                self._closed = asyncio.Event()
+                self._session_task = asyncio.create_task(self._run_session(ready))
+                await ready
+        return self._session
+    
+    async def _run_session(self, ready: asyncio.Future):
+        """Hold the MCP server process and session open until close() is called."""
+        # stdio_client and ClientSession must be entered and exited in the same
+        # task, so a dedicated task owns them for the lifetime of the session
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    # Initialize the session
+            async with self.stdio_client(self.server_params) as (read, write):
+                async with self.client_session(read, write) as session:
                     await session.initialize()
-                    
-                    if method == "list_resources":
-                        resources = await session.list_resources()
-                        return {
-                            "resources": [
-                                {
-                                    "uri": r.uri,
-                                    "name": r.name,
-                                    "description": r.description
-                                }
-                                for r in resources.resources
-                            ]
-                        }
-                    
-                    elif method == "list_tools":
-                        tools = await session.list_tools()
-                        return {
-                            "tools": [
-                                {
-                                    "name": t.name,
-                                    "description": t.description,
-                                    "inputSchema": t.inputSchema
-                                }
-                                for t in tools.tools
-                            ]
-                        }
-                    
-                    elif method == "call_tool":
-                        tool_name = params.get("name")
-                        tool_params = params.get("arguments", {})
-                        
-                        result = await session.call_tool(tool_name, tool_params)
-                        return {
-                            "result": result.content
-                        }
-                    
-                    elif method == "read_resource":
-                        resource_uri = params.get("uri")
-                        result = await session.read_resource(resource_uri)
-                        return {
-                            "contents": result.contents
-                        }
-                    
-                    else:
-                        raise ValueError(f"Unknown method: {method}")
+                    self._session = session
+                    ready.set_result(None)
+                    await self._closed.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.error(f"MCP session ended unexpectedly: {str(e)}")
+        finally:
+            self._session = None
+    
+    async def close(self):
+        """Shut down the MCP session and server process."""
+        if self._session_task is not None:
+            self._closed.set()
+            await self._session_task
+            self._session_task = None
+    
+    async def client_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the MCP server's ServiceNow cache stats, or None if no session is running."""
+        # Never starts a session, so health checks stay cheap before the first request
+        if self._session is None:
+            return None
+        try:
+            result = await asyncio.wait_for(
+                self._session.read_resource(CLIENT_CACHE_STATS_URI), timeout=5
+            )
+            return orjson.loads(result.contents[0].text)
+        except Exception as e:
+            logger.warning(f"Could not read ServiceNow cache stats: {str(e)}")
+            return None
+    
+    async def call_mcp_server(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the MCP server with given method and parameters, using cached results when possible."""
+        if method not in CACHEABLE_METHODS:
+            return await self._call_mcp_server(method, params)
+        
+        cache_key = (method, json.dumps(params, sort_keys=True))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.cache_stats["hits"] += 1
+            CACHE_REQUESTS.labels("bridge", "hit").inc()
+            return cached
+        
+        self.cache_stats["misses"] += 1
+        CACHE_REQUESTS.labels("bridge", "miss").inc()
+        result = await self._call_mcp_server(method, params)
+        self.cache[cache_key] = result
+        return result
+    
+    async def _call_mcp_server(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the MCP server with given method and parameters."""
+        handler = self.METHOD_HANDLERS.get(method)
+        if handler is None:
+            raise ValueError(f"Unknown method: {method}")
+        
+        try:
+            session = await self.get_session()
+            return await handler(self, session, params)
+        
+        except self.session_errors as e:
+            # The server process has gone away; start a fresh one on the next call
+            logger.error(f"MCP session lost, resetting: {str(e)}")
+            await self.close()
+            raise
+        
+        except (ServiceNowUnavailableError, ServiceNowTimeoutError):
+            raise
         
         except Exception as e:
             logger.error(f"Error calling MCP server: {str(e)}")
+            raise_for_servicenow_error(str(e))
             raise
+    
+    async def _list_resources(self, session: "ClientSession", params: Dict[str, Any]) -> Dict[str, Any]:
+        """List the MCP server's resources."""
+        resources = await session.list_resources()
+        return {
+            "resources": [
+                {
+                    "uri": str(r.uri),
+                    "name": r.name,
+                    "description": r.description
+                }
+                for r in resources.resources
+            ]
+        }
+    
+    async def _list_tools(self, session: "ClientSession", params: Dict[str, Any]) -> Dict[str, Any]:
+        """List the MCP server's tools."""
+        tools = await session.list_tools()
+        return {
+            "tools": [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "inputSchema": t.inputSchema
+                }
+                for t in tools.tools
+            ]
+        }
+    
+    async def _call_tool(self, session: "ClientSession", params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call an MCP tool."""
+        tool_name = params.get("name")
+        tool_params = params.get("arguments", {})
+        
+        result = await session.call_tool(tool_name, tool_params)
+        if result.isError:
+            for content in result.content:
+                raise_for_servicenow_error(getattr(content, "text", ""))
+        return {
+            "result": result.content
+        }
+    
+    async def _read_resource(self, session: "ClientSession", params: Dict[str, Any]) -> Dict[str, Any]:
+        """Read an MCP resource."""
+        resource_uri = params.get("uri")
+        result = await session.read_resource(resource_uri)
+        return {
+            "contents": result.contents
+        }
+    
+    # MCP method name -> handler, looked up once per call instead of an if/elif chain
+    METHOD_HANDLERS = {
+        "list_resources": _list_resources,
+        "list_tools": _list_tools,
+        "call_tool": _call_tool,
+        "read_resource": _read_resource,
+    }
 
 
-# Global bridge instance
+# Bridge shared by every request; each bridge starts its own MCP server, so
+# it must only be built once per process
 mcp_bridge = None
+mcp_bridge_lock = threading.Lock()
 
 
-def get_bridge():
+def get_bridge() -> MCPBridge:
     """Get or create MCP bridge instance."""
     global mcp_bridge
+    # Checked again under the lock so concurrent first requests build one bridge
     if mcp_bridge is None:
-        mcp_bridge = MCPBridge()
+        with mcp_bridge_lock:
+            if mcp_bridge is None:
+                mcp_bridge = MCPBridge()
     return mcp_bridge
 
 
+# Bytes read from ServiceNow per chunk when streaming a table query
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Largest limit a streamed table query may ask for
+MAX_STREAM_LIMIT = int(os.getenv('SERVICENOW_MAX_STREAM_LIMIT', 10000))
+
+# Upstream statuses retried before streaming starts, as ServiceNowClient does
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class UpstreamError(Exception):
+    """ServiceNow rejected a streamed query; carries the status and body to return."""
+    
+    def __init__(self, status: int, body: Dict[str, Any]):
+        super().__init__(body.get("error"))
+        self.status = status
+        self.body = body
+
+
+class TableStreamer:
+    """Stream table queries straight from ServiceNow, bypassing the MCP server.
+    
+    Large result sets are relayed chunk by chunk instead of being held in
+    memory. Calls share a connection pool and go through the same safeguards
+    as ServiceNowClient: a concurrency limit, a circuit breaker, retries of
+    transient failures, and upstream metrics.
+    """
+    
+    def __init__(self, max_inflight: Optional[int] = None, max_retries: int = 3,
+                 backoff_factor: float = 0.5):
+        self.instance_url = os.getenv('SERVICENOW_INSTANCE_URL')
+        username = os.getenv('SERVICENOW_USERNAME')
+        password = os.getenv('SERVICENOW_PASSWORD')
+        
+        if not all([self.instance_url, username, password]):
+            raise ValueError("Missing ServiceNow credentials in environment variables")
+        
+        self.instance_url = self.instance_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        
+        if max_inflight is None:
+            max_inflight = int(os.getenv("SERVICENOW_MAX_INFLIGHT", 16))
+        # Held for the whole stream, not just until the headers arrive
+        self.inflight = threading.BoundedSemaphore(max_inflight)
+        self.breaker = CircuitBreaker()
+        
+        self.client = httpx.Client(
+            auth=(username, password),
+            headers={"Accept": "application/json"},
+            timeout=httpx.Timeout(Config.REQUEST_TIMEOUT, connect=5),
+            transport=httpx.HTTPTransport(
+                limits=httpx.Limits(max_connections=max_inflight),
+                retries=max_retries
+            )
+        )
+    
+    def close(self):
+        """Close the connection pool."""
+        self.client.close()
+    
+    def stream_table(self, table: str, query: str = "", limit: int = 1000,
+                     fields: Optional[List[str]] = None) -> "TableStream":
+        """Query a ServiceNow table, returning the response body as it arrives.
+        
+        Errors are raised before any of the body is returned: CircuitOpenError
+        while ServiceNow is failing, httpx.TimeoutException, and UpstreamError
+        when ServiceNow rejects the query or returns something other than JSON.
+        """
+        params = {"sysparm_limit": limit}
+        if query:
+            params["sysparm_query"] = query
+        if fields:
+            params["sysparm_fields"] = ",".join(fields)
+        request = self.client.build_request(
+            "GET", f"{self.instance_url}/api/now/table/{table}", params=params
+        )
+        
+        self.breaker.before_call()
+        self.inflight.acquire()
+        try:
+            response = self._send(request, table)
+        except BaseException:
+            self.inflight.release()
+            raise
+        
+        return TableStream(response, self.inflight)
+    
+    def _send(self, request: httpx.Request, table: str) -> httpx.Response:
+        """Send a request, retrying transient failures, and check the response."""
+        latency = UPSTREAM_LATENCY.labels("GET", f"table/{table}")
+        for attempt in range(self.max_retries + 1):
+            try:
+                with latency.time():
+                    response = self.client.send(request, stream=True)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                raise
+            
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            response.close()
+            logger.warning(f"ServiceNow returned {response.status_code} for table {table}, retrying")
+            time.sleep(self.backoff_factor * 2 ** attempt)
+        
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        
+        if response.is_success and \
+                response.headers.get("Content-Type", "").startswith("application/json"):
+            return response
+        
+        response.read()
+        response.close()
+        raise UpstreamError(*self._error_for(response))
+    
+    @staticmethod
+    def _error_for(response: httpx.Response):
+        """Status and JSON body to return for a ServiceNow response that cannot be relayed."""
+        logger.error(f"ServiceNow API error {response.status_code}: {response.text[:500]}")
+        if response.is_success:
+            return 502, {"error": "ServiceNow returned a non-JSON response"}
+        if response.status_code in (401, 403):
+            # The bridge's own credentials were rejected, not the caller's
+            return 502, {"error": "ServiceNow rejected the bridge's credentials"}
+        if response.status_code >= 500 or response.status_code == 429:
+            return 502, {"error": f"ServiceNow returned {response.status_code}"}
+        try:
+            detail = response.json().get("error")
+        except ValueError:
+            detail = None
+        return response.status_code, {"error": detail or f"ServiceNow returned {response.status_code}"}
+
+
+class TableStream:
+    """Response body that relays a ServiceNow response and frees its connection slot.
+    
+    The WSGI server calls close() even if the client disconnects before the
+    body is read, which a plain generator would not clean up after.
+    """
+    
+    def __init__(self, response: httpx.Response, slot: threading.BoundedSemaphore):
+        self.response = response
+        self.slot = slot
+        self.closed = False
+    
+    def __iter__(self) -> Iterator[bytes]:
+        with UPSTREAM_INFLIGHT.track_inprogress():
+            yield from self.response.iter_bytes(STREAM_CHUNK_SIZE)
+    
+    def close(self):
+        """Close the upstream response and release the connection slot."""
+        if not self.closed:
+            self.closed = True
+            self.response.close()
+            self.slot.release()
+
+
+# Table streamer shared by every request, see get_streamer()
+table_streamer = None
+table_streamer_lock = threading.Lock()
+
+
+def get_streamer() -> TableStreamer:
+    """Get or create the table streamer, closing its connections at exit."""
+    global table_streamer
+    if table_streamer is None:
+        with table_streamer_lock:
+            if table_streamer is None:
+                table_streamer = TableStreamer()
+                atexit.register(table_streamer.close)
+    return table_streamer
+
+
+# Event loop shared by all requests, running on a background thread
+bridge_loop = None
+bridge_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the bridge event loop, starting it on first use."""
+    global bridge_loop
+    with bridge_loop_lock:
+        if bridge_loop is None:
+            bridge_loop = asyncio.new_event_loop()
+            threading.Thread(target=bridge_loop.run_forever, name="mcp-bridge-loop", daemon=True).start()
+    return bridge_loop
+
+
+def run_async(coro):
+    """Run a coroutine on the bridge event loop and wait for its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout=Config.REQUEST_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+HEALTH_INFO = {
+    "status": "healthy",
+    "service": "ServiceNow MCP-over-HTTP Bridge",
+    "version": "1.0.0",
+    "mcp_available": mcp_available(),
+    "endpoints": {
+        "health": "GET /",
+        "mcp": "POST /mcp",
+        "list_resources": "GET /mcp/resources",
+        "list_tools": "GET /mcp/tools",
+        "call_tool": "POST /mcp/tool/<tool_name>",
+        "read_resource": "GET /mcp/resource?uri=<uri>",
+        "query_table": "GET /mcp/table/<table>?query=<query>&limit=<limit>&fields=<fields>",
+        "stats": "GET /mcp/stats",
+        "metrics": "GET /metrics"
+    }
+}
+
+# Serialized health check body and the cache stats it was built from; only
+# re-serialized when the stats have changed since the last check
+health_body = (None, b"")
+
+# Returned with a 503 while the MCP server's circuit breaker is open
+UNAVAILABLE_BODY = orjson.dumps({"status": "error", "reason": SERVICENOW_UNAVAILABLE})
+
+# Returned with a 400 when a request body is not valid JSON
+INVALID_JSON_BODY = orjson.dumps({"error": "invalid json"})
+
+# Returned with a 504 when ServiceNow or the MCP server does not answer in time
+TIMEOUT_BODY = orjson.dumps({"status": "error", "reason": SERVICENOW_TIMEOUT})
+
+# Seconds clients may reuse a tool or resource listing before asking again
+LISTING_MAX_AGE = 300
+
+# Serialized listings and their ETags, reused while the bridge cache returns the same result
+listing_bodies = {}
+
+
+def listing_response(method: str):
+    """Respond with an MCP listing, serializing it only when the cached result changes."""
+    result = run_async(get_bridge().call_mcp_server(method, {}))
+    
+    entry = listing_bodies.get(method)
+    if entry is None or entry[0] is not result:
+        body = orjson.dumps(result, default=_json_default)
+        entry = (result, body, hashlib.sha1(body).hexdigest())
+        listing_bodies[method] = entry
+    _, body, etag = entry
+    
+    response = app.response_class(body, status=200, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.max_age = LISTING_MAX_AGE
+    # Answers 304 Not Modified when the client already has this ETag
+    return response.make_conditional(request)
+
+
+@app.before_request
+def start_timer():
+    """Record when handling of the request started."""
+    g.start_time = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    """Record how long the request took to handle."""
+    start_time = g.pop('start_time', None)
+    if start_time is not None:
+        HTTP_LATENCY.labels(
+            request.method, request.endpoint or "unmatched", response.status_code
+        ).observe(time.perf_counter() - start_time)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint."""
+    if not METRICS_AVAILABLE:
+        return json_response({
+            "error": "prometheus_client not available",
+            "hint": "Install with: pip install prometheus-client"
+        }, 501)
+    
+    body, content_type = render_latest()
+    return app.response_class(body, status=200, content_type=content_type)
+
+
 @app.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        "status": "healthy",
-        "service": "ServiceNow MCP-over-HTTP Bridge",
-        "version": "1.0.0",
-        "mcp_available": MCP_AVAILABLE,
-        "endpoints": {
-            "health": "GET /",
-            "mcp": "POST /mcp",
-            "list_resources": "GET /mcp/resources",
-            "list_tools": "GET /mcp/tools",
-            "call_tool": "POST /mcp/tool/<tool_name>",
-            "read_resource": "GET /mcp/resource?uri=<uri>"
-        }
-    }), 200
+    global health_body
+    # Only report stats once a request has created the bridge
+    if mcp_bridge is not None:
+        stats = dict(mcp_bridge.cache_stats)
+    else:
+        stats = {"hits": 0, "misses": 0}
+    
+    key = tuple(stats.values())
+    if health_body[0] != key:
+        health_body = (key, orjson.dumps({**HEALTH_INFO, "cache": stats}))
+    return json_response(health_body[1], 200)
+
+
+@app.route('/mcp/stats', methods=['GET'])
+def cache_stats():
+    """Report the bridge's and the MCP server's ServiceNow cache stats.
+    
+    Kept off the health check because reading the server's stats is an MCP round trip.
+    """
+    bridge = mcp_bridge
+    if bridge is None:
+        return json_response({"cache": {"hits": 0, "misses": 0}, "servicenow_cache": None}, 200)
+    
+    return json_response({
+        "cache": dict(bridge.cache_stats),
+        "servicenow_cache": run_async(bridge.client_cache_stats())
+    }, 200)
 
 
 @app.route('/mcp', methods=['POST'])
@@ -162,93 +655,79 @@ def mcp_endpoint():
     }
     """
     try:
-        if not MCP_AVAILABLE:
-            return jsonify({
+        if not mcp_available():
+            return json_response({
                 "error": "MCP library not available",
                 "hint": "Install with: pip install mcp"
-            }), 500
+            }, 500)
         
-        data = request.get_json()
+        data = parse_json()
         if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+            return json_response({"error": "No JSON data provided"}, 400)
+        if not isinstance(data, dict):
+            return json_response({"error": "JSON body must be an object"}, 400)
         
         method = data.get('method')
         params = data.get('params', {})
         
         if not method:
-            return jsonify({"error": "Method is required"}), 400
+            return json_response({"error": "Method is required"}, 400)
         
         logger.info(f"MCP request: {method} with params: {params}")
         
-        # Run async function in sync context
         bridge = get_bridge()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(bridge.call_mcp_server(method, params))
-            return jsonify(result), 200
-        finally:
-            loop.close()
+        result = run_async(bridge.call_mcp_server(method, params))
+        return json_response(result, 200)
+    
+    except orjson.JSONDecodeError:
+        return json_response(INVALID_JSON_BODY, 400)
+    
+    except ServiceNowUnavailableError as e:
+        logger.warning(f"ServiceNow unavailable: {str(e)}")
+        return json_response(UNAVAILABLE_BODY, 503)
+    
+    except (ServiceNowTimeoutError, concurrent.futures.TimeoutError) as e:
+        logger.warning(f"ServiceNow request timed out: {str(e)}")
+        return json_response(TIMEOUT_BODY, 504)
     
     except Exception as e:
         logger.error(f"Error in MCP endpoint: {str(e)}")
-        return jsonify({
+        return json_response({
             "error": str(e),
             "type": type(e).__name__
-        }), 500
+        }, 500)
 
 
 @app.route('/mcp/resources', methods=['GET'])
 def list_resources():
     """List available MCP resources."""
     try:
-        if not MCP_AVAILABLE:
-            return jsonify({
+        if not mcp_available():
+            return json_response({
                 "error": "MCP library not available"
-            }), 500
-        
-        bridge = get_bridge()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+            }, 500)
         
-        try:
-            result = loop.run_until_complete(
-                bridge.call_mcp_server("list_resources", {})
-            )
-            return jsonify(result), 200
-        finally:
-            loop.close()
+        return listing_response("list_resources")
     
     except Exception as e:
         logger.error(f"Error listing resources: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 @app.route('/mcp/tools', methods=['GET'])
 def list_tools():
     """List available MCP tools."""
     try:
-        if not MCP_AVAILABLE:
-            return jsonify({
+        if not mcp_available():
+            return json_response({
                 "error": "MCP library not available"
-            }), 500
-        
-        bridge = get_bridge()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+            }, 500)
         
-        try:
-            result = loop.run_until_complete(
-                bridge.call_mcp_server("list_tools", {})
-            )
-            return jsonify(result), 200
-        finally:
-            loop.close()
+        return listing_response("list_tools")
     
     except Exception as e:
         logger.error(f"Error listing tools: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 @app.route('/mcp/tool/<tool_name>', methods=['POST'])
@@ -257,33 +736,44 @@ def call_tool(tool_name: str):
     Call an MCP tool.
     
     Expected JSON body contains the tool arguments.
+    Optional query parameter: fields (comma-separated, e.g. number,short_description)
     """
     try:
-        if not MCP_AVAILABLE:
-            return jsonify({
+        if not mcp_available():
+            return json_response({
                 "error": "MCP library not available"
-            }), 500
+            }, 500)
         
-        arguments = request.get_json() or {}
+        arguments = parse_json() or {}
+        if not isinstance(arguments, dict):
+            return json_response({"error": "JSON body must be an object"}, 400)
         
-        bridge = get_bridge()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # ?fields=number,short_description limits the columns ServiceNow returns
+        fields = request.args.get('fields')
+        if fields:
+            arguments["fields"] = [f.strip() for f in fields.split(',') if f.strip()]
         
-        try:
-            result = loop.run_until_complete(
-                bridge.call_mcp_server("call_tool", {
-                    "name": tool_name,
-                    "arguments": arguments
-                })
-            )
-            return jsonify(result), 200
-        finally:
-            loop.close()
+        bridge = get_bridge()
+        result = run_async(bridge.call_mcp_server("call_tool", {
+            "name": tool_name,
+            "arguments": arguments
+        }))
+        return json_response(result, 200)
+    
+    except orjson.JSONDecodeError:
+        return json_response(INVALID_JSON_BODY, 400)
+    
+    except ServiceNowUnavailableError as e:
+        logger.warning(f"ServiceNow unavailable: {str(e)}")
+        return json_response(UNAVAILABLE_BODY, 503)
+    
+    except (ServiceNowTimeoutError, concurrent.futures.TimeoutError) as e:
+        logger.warning(f"ServiceNow request timed out: {str(e)}")
+        return json_response(TIMEOUT_BODY, 504)
     
     except Exception as e:
         logger.error(f"Error calling tool: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 @app.route('/mcp/resource', methods=['GET'])
@@ -294,49 +784,98 @@ def read_resource():
     Query parameter: uri (e.g., servicenow://incidents)
     """
     try:
-        if not MCP_AVAILABLE:
-            return jsonify({
+        if not mcp_available():
+            return json_response({
                 "error": "MCP library not available"
-            }), 500
+            }, 500)
         
         uri = request.args.get('uri')
         if not uri:
-            return jsonify({"error": "uri parameter is required"}), 400
+            return json_response({"error": "uri parameter is required"}, 400)
         
         bridge = get_bridge()
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                bridge.call_mcp_server("read_resource", {"uri": uri})
-            )
-            return jsonify(result), 200
-        finally:
-            loop.close()
+        result = run_async(bridge.call_mcp_server("read_resource", {"uri": uri}))
+        return json_response(result, 200)
+    
+    except ServiceNowUnavailableError as e:
+        logger.warning(f"ServiceNow unavailable: {str(e)}")
+        return json_response(UNAVAILABLE_BODY, 503)
+    
+    except (ServiceNowTimeoutError, concurrent.futures.TimeoutError) as e:
+        logger.warning(f"ServiceNow request timed out: {str(e)}")
+        return json_response(TIMEOUT_BODY, 504)
     
     except Exception as e:
         logger.error(f"Error reading resource: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
+
+
+@app.route('/mcp/table/<table>', methods=['GET'])
+def query_table(table: str):
+    """
+    Stream records from a ServiceNow table.
+    
+    Query parameters: query (encoded query), limit (default 1000, at most
+    SERVICENOW_MAX_STREAM_LIMIT), fields (comma-separated, e.g. number,short_description)
+    """
+    if not re.fullmatch(r'\w+', table):
+        return json_response({"error": "Invalid table name"}, 400)
+    
+    try:
+        limit = int(request.args.get('limit', 1000))
+    except ValueError:
+        return json_response({"error": "limit must be an integer"}, 400)
+    if not 1 <= limit <= MAX_STREAM_LIMIT:
+        return json_response({"error": f"limit must be between 1 and {MAX_STREAM_LIMIT}"}, 400)
+    
+    fields = request.args.get('fields')
+    if fields:
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+    
+    try:
+        body = get_streamer().stream_table(table, request.args.get('query', ''), limit, fields)
+    
+    except UpstreamError as e:
+        return json_response(e.body, e.status)
+    
+    except CircuitOpenError as e:
+        logger.warning(f"ServiceNow unavailable: {str(e)}")
+        return json_response(UNAVAILABLE_BODY, 503)
+    
+    except httpx.TimeoutException as e:
+        logger.warning(f"ServiceNow request timed out: {str(e)}")
+        return json_response(TIMEOUT_BODY, 504)
+    
+    except httpx.TransportError as e:
+        logger.error(f"Error connecting to ServiceNow: {str(e)}")
+        return json_response({"error": "Could not reach ServiceNow"}, 502)
+    
+    except Exception as e:
+        logger.error(f"Error querying table: {str(e)}")
+        return json_response({"error": str(e)}, 500)
+    
+    # Relay ServiceNow's JSON as-is, chunk by chunk. The body is passed directly
+    # rather than through stream_with_context so its close() always runs.
+    return app.response_class(body, mimetype='application/json')
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({
+    return json_response({
         "error": "Endpoint not found",
         "message": "Please check the API documentation at GET /"
-    }), 404
+    }, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error(f"Internal server error: {str(error)}")
-    return jsonify({
+    return json_response({
         "error": "Internal server error",
         "message": str(error)
-    }), 500
+    }, 500)
 
 
 if __name__ == '__main__':
@@ -344,7 +883,7 @@ if __name__ == '__main__':
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
     logger.info(f"Starting ServiceNow MCP-over-HTTP Bridge on port {port}")
-    logger.info(f"MCP library available: {MCP_AVAILABLE}")
+    logger.info(f"MCP library available: {mcp_available()}")
     
     app.run(
         host='0.0.0.0',
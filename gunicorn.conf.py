@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the ServiceNow MCP HTTP bridge.
+
+Gunicorn picks this file up automatically from the working directory:
+
+    gunicorn app_mcp:app
+"""
+
+import multiprocessing
+import os
+
+from config import Config
+from mcp_server_servicenow.metrics import mark_process_dead
+
+bind = f"{Config.HOST}:{Config.PORT}"
+
+# Requests spend nearly all their time waiting on ServiceNow, so use threaded
+# workers; threads release the GIL while blocked on the network
+worker_class = "gthread"
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+
+keepalive = 30
+timeout = Config.REQUEST_TIMEOUT
+
+
+def child_exit(server, worker):
+    """Stop reporting in-flight gauges for a worker that has exited."""
+    mark_process_dead(worker.pid)
@@ -0,0 +1,92 @@
+"""
+Request batching for ServiceNow MCP Server
+
+This module collects concurrent single-record lookups so they can be fetched from ServiceNow
+with one bulk request instead of one request per record.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+class RequestBatcher:
+    """Fuse concurrent lookups into bulk fetches
+
+    Lookups are grouped (e.g. by table). A group is dispatched as soon as it holds
+    max_batch_size distinct ids, or max_delay seconds after its first lookup,
+    whichever comes first. The delay only applies while an earlier batch for the
+    group is still being fetched; otherwise the group is dispatched on the next
+    event loop iteration, so a lone lookup is not held back.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[Hashable, List[str]], Awaitable[Dict[str, Any]]],
+                 max_batch_size: int = 32,
+                 max_delay: float = 0.05):
+        """
+        Args:
+            fetch: Coroutine function taking a group and a list of ids and returning
+                   a dict of results keyed by id (missing ids resolve to None)
+            max_batch_size: Number of distinct ids that triggers an immediate dispatch
+            max_delay: Seconds to wait for more lookups before dispatching
+        """
+        self.fetch = fetch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[Hashable, Dict[str, List[asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.Handle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        # Number of batches per group currently being fetched
+        self._active: Dict[Hashable, int] = {}
+
+    async def get(self, group: Hashable, item_id: str) -> Optional[Any]:
+        """Look up a single id, waiting for the batch it lands in to be fetched"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(group, {})
+        batch.setdefault(item_id, []).append(future)
+
+        if len(batch) >= self.max_batch_size:
+            self._dispatch(group)
+        elif group not in self._timers:
+            if self._active.get(group):
+                self._timers[group] = loop.call_later(self.max_delay, self._dispatch, group)
+            else:
+                # Lookups made in the same iteration still land in this batch
+                self._timers[group] = loop.call_soon(self._dispatch, group)
+
+        return await future
+
+    def _dispatch(self, group: Hashable):
+        """Send the pending batch for a group"""
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(group, None)
+        if batch:
+            self._active[group] = self._active.get(group, 0) + 1
+            # Keep a reference so the task is not garbage collected mid-flight
+            task = asyncio.ensure_future(self._resolve(group, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, group: Hashable, batch: Dict[str, List[asyncio.Future]]):
+        """Fetch a batch and hand each waiter its result"""
+        try:
+            results = await self.fetch(group, list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        finally:
+            self._active[group] -= 1
+            if not self._active[group]:
+                del self._active[group]
+
+        for item_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(item_id))
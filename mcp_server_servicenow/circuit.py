@@ -0,0 +1,59 @@
+"""
+Circuit breaker for ServiceNow MCP Server
+
+This module stops calls to a failing ServiceNow instance for a cooldown period so that
+requests fail fast instead of waiting on timeouts and retries.
+"""
+
+import time
+from typing import Callable, Optional
+
+from mcp_server_servicenow.errors import SERVICENOW_UNAVAILABLE
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the circuit is open"""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    After fail_max consecutive failures the circuit opens and calls are rejected
+    for reset_timeout seconds. Calls are then let through again; the first
+    success closes the circuit, while another failure re-opens it straight away.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open, or half-open"""
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def before_call(self):
+        """Raise CircuitOpenError if calls are currently being rejected"""
+        if self.state == "open":
+            remaining = self.reset_timeout - (self.clock() - self.opened_at)
+            raise CircuitOpenError(
+                f"{SERVICENOW_UNAVAILABLE}: ServiceNow failed {self.failures} consecutive "
+                f"requests; retrying in {remaining:.0f}s"
+            )
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit once fail_max is reached"""
+        self.failures += 1
+        if self.failures >= self.fail_max:
+            self.opened_at = self.clock()
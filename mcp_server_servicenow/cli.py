@@ -19,6 +19,8 @@ def main():
     parser = argparse.ArgumentParser(description="ServiceNow MCP Server")
     parser.add_argument("--url", help="ServiceNow instance URL", default=os.environ.get("SERVICENOW_INSTANCE_URL"))
     parser.add_argument("--transport", help="Transport protocol (stdio or sse)", default="stdio", choices=["stdio", "sse"])
+    parser.add_argument("--metrics-port", help="Port to serve Prometheus metrics on", type=int,
+                        default=os.environ.get("SERVICENOW_METRICS_PORT"))
     
     # Authentication options
     auth_group = parser.add_argument_group("Authentication")
@@ -51,6 +53,18 @@ def main():
         print("Either provide username/password, token, or OAuth credentials")
         sys.exit(1)
     
+    # stdout carries the MCP stdio transport, so warnings go to stderr
+    if args.metrics_port:
+        from mcp_server_servicenow.metrics import METRICS_AVAILABLE, start_metrics_server
+        if METRICS_AVAILABLE:
+            try:
+                start_metrics_server(args.metrics_port)
+            except OSError as e:
+                # Another server process already holds the port; keep serving MCP without it
+                print(f"Warning: could not serve metrics on port {args.metrics_port}: {e}", file=sys.stderr)
+        else:
+            print("Warning: prometheus_client is not installed, metrics are disabled", file=sys.stderr)
+    
     # Create and run the server
     server = ServiceNowMCP(instance_url=args.url, auth=auth)
     server.run(transport=args.transport)
@@ -0,0 +1,13 @@
+"""
+Errors for ServiceNow MCP Server
+
+Errors raised inside the MCP server only reach HTTP clients as text, so each one carries
+a marker that the HTTP bridge can recognise and map to a status code.
+"""
+
+# Markers included in error messages
+SERVICENOW_UNAVAILABLE = "servicenow_unavailable"
+SERVICENOW_TIMEOUT = "servicenow_timeout"
+
+class ServiceNowTimeoutError(Exception):
+    """Raised when ServiceNow does not respond within the request timeout"""
@@ -0,0 +1,89 @@
+"""
+Prometheus metrics for ServiceNow MCP Server
+
+This module defines the metrics recorded by the ServiceNow client and the HTTP bridge.
+prometheus_client is optional; without it every metric is a no-op.
+
+When PROMETHEUS_MULTIPROC_DIR is set, every process (each Gunicorn worker and the MCP
+server each one starts) writes its metrics to that directory and render_latest() reports
+the total across all of them.
+"""
+
+import os
+from contextlib import nullcontext
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+        generate_latest, multiprocess, start_http_server
+    )
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+class _NoopMetric:
+    """Stand-in for a metric when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def observe(self, amount: float):
+        pass
+
+    def time(self):
+        return nullcontext()
+
+    def track_inprogress(self):
+        return nullcontext()
+
+if METRICS_AVAILABLE:
+    # ServiceNow round-trip time per attempt, labelled by e.g. "table/incident"
+    UPSTREAM_LATENCY = Histogram(
+        "snow_upstream_seconds", "ServiceNow request round-trip time",
+        ["method", "endpoint_prefix"]
+    )
+    # Requests currently holding a connection slot, out of max_inflight
+    UPSTREAM_INFLIGHT = Gauge(
+        "snow_upstream_inflight", "ServiceNow requests in flight", multiprocess_mode="livesum"
+    )
+    # Cache lookups by cache ("client" or "bridge") and result ("hit", "miss" or "stale")
+    CACHE_REQUESTS = Counter(
+        "snow_cache_requests_total", "Response cache lookups", ["cache", "result"]
+    )
+    # HTTP bridge handler latency by Flask endpoint
+    HTTP_LATENCY = Histogram(
+        "bridge_request_seconds", "HTTP bridge request handling time",
+        ["method", "endpoint", "status"]
+    )
+else:
+    UPSTREAM_LATENCY = UPSTREAM_INFLIGHT = CACHE_REQUESTS = HTTP_LATENCY = _NoopMetric()
+
+def endpoint_prefix(path: str) -> str:
+    """Reduce an API path to a low-cardinality label, e.g. /api/now/table/incident/abc -> table/incident"""
+    parts = path.strip("/").split("/")
+    if parts[:2] == ["api", "now"]:
+        parts = parts[2:]
+    return "/".join(parts[:2])
+
+def render_latest():
+    """Return the metrics exposition body and its content type"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+def start_metrics_server(port: int):
+    """Serve metrics over HTTP on the given port"""
+    start_http_server(port)
+
+def mark_process_dead(pid: int):
+    """Drop the live gauges of an exited process in multiprocess mode"""
+    if METRICS_AVAILABLE and "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
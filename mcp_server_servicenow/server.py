@@ -8,16 +8,24 @@ It allows AI agents to access and manipulate ServiceNow data through a secure AP
 import os
 import json
 import asyncio
+import importlib.util
 import logging
 import re
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union, Literal, Tuple
 
-import requests
 import httpx
+import orjson
+from cachetools import TTLCache
 from pydantic import BaseModel, Field, field_validator
 
+from mcp_server_servicenow.batching import RequestBatcher
+from mcp_server_servicenow.circuit import CircuitBreaker, CircuitOpenError
+from mcp_server_servicenow.errors import SERVICENOW_TIMEOUT, ServiceNowTimeoutError
+from mcp_server_servicenow.metrics import (
+    CACHE_REQUESTS, UPSTREAM_INFLIGHT, UPSTREAM_LATENCY, endpoint_prefix
+)
 from mcp_server_servicenow.nlp import NLPProcessor
 
 from mcp.server.fastmcp import FastMCP, Context
@@ -25,6 +33,10 @@ from mcp.server.fastmcp.utilities.logging import get_logger
 
 logger = get_logger(__name__)
 
+def to_json(obj: Any) -> str:
+    """Serialize a result as indented JSON for MCP responses"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
 # ServiceNow API models
 class IncidentState(int, Enum):
     NEW = 1
@@ -190,13 +202,97 @@ class OAuthAuth(Authentication):
             expires_in = result.get("expires_in", 1800)  # Default 30 minutes
             self.token_expiry = datetime.now().timestamp() + expires_in
 
+# HTTP statuses that are retried for idempotent requests
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+ALLOWED_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Longest Retry-After (in seconds) that is honoured before retrying
+MAX_RETRY_AFTER = 30
+
+# Fields returned when listing incidents, instead of every column
+DEFAULT_INCIDENT_FIELDS = [
+    "sys_id", "number", "short_description", "state", "priority", "urgency", "impact",
+    "category", "assigned_to", "assignment_group", "opened_at", "sys_updated_on"
+]
+
+# Maximum number of sys_ids per bulk lookup, keeping the request URL well under length limits
+BULK_CHUNK_SIZE = 100
+
 class ServiceNowClient:
     """Client for interacting with ServiceNow API"""
     
-    def __init__(self, instance_url: str, auth: Authentication):
+    def __init__(self, instance_url: str, auth: Authentication,
+                 max_connections: int = 64,
+                 max_keepalive_connections: int = 32,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 timeout: Optional[float] = None,
+                 connect_timeout: float = 5,
+                 http2: Optional[bool] = None,
+                 max_inflight: Optional[int] = None,
+                 breaker_fail_max: int = 5,
+                 breaker_reset_timeout: float = 30,
+                 cache_size: int = 2048,
+                 cache_ttl: float = 30,
+                 stale_if_error: bool = True,
+                 stale_ttl: float = 3600,
+                 batch_size: int = 32,
+                 batch_delay: float = 0.05):
         self.instance_url = instance_url.rstrip('/')
         self.auth = auth
-        self.client = httpx.AsyncClient()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        
+        # Cap on concurrent ServiceNow calls so bursts queue here instead of
+        # tripping the instance's rate limits; the semaphore is created lazily
+        # so it binds to the event loop the server runs on
+        if max_inflight is None:
+            max_inflight = int(os.getenv("SERVICENOW_MAX_INFLIGHT", 16))
+        self.max_inflight = max_inflight
+        self._inflight = None
+        
+        # Fail fast while the instance is down instead of waiting on timeouts and retries
+        self.breaker = CircuitBreaker(breaker_fail_max, breaker_reset_timeout)
+        
+        # Short-lived cache of GET responses, keyed by path and query parameters
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        
+        # Last good response per key, served when ServiceNow is failing as long
+        # as it is no older than stale_ttl seconds
+        self.stale_if_error = stale_if_error
+        self.stale_cache = TTLCache(maxsize=cache_size, ttl=stale_ttl)
+        self.cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+        
+        # Upstream GETs in progress, so concurrent identical GETs share one call
+        self._pending_gets: Dict[Tuple, asyncio.Task] = {}
+        
+        # Bumped per table on every write, so GETs that were in flight during
+        # the write do not cache what they read
+        self._generations: Dict[str, int] = {}
+        
+        # Concurrent get_record calls for the same table and fields are fetched together
+        self.batcher = RequestBatcher(self._fetch_batch, batch_size, batch_delay)
+        
+        # A single pooled client keeps connections (and their TLS sessions) alive
+        # between calls; the transport retries failed connection attempts
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        # Bound every call so a stuck connection cannot hold a request forever
+        if timeout is None:
+            timeout = float(os.getenv("REQUEST_TIMEOUT", 300))
+        # HTTP/2 multiplexes concurrent calls over one TLS connection; it needs
+        # the h2 package (httpx[http2]). Responses are gzip-compressed by default.
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self.client = httpx.AsyncClient(
+            headers={"Accept": "application/json"},
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            auth=auth.get_auth() if isinstance(auth, BasicAuth) else None,
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=max_retries, http2=http2)
+        )
         
     async def close(self):
         """Close the HTTP client"""
@@ -206,42 +302,225 @@ class ServiceNowClient:
                     params: Optional[Dict[str, Any]] = None,
                     json_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a request to the ServiceNow API"""
-        url = f"{self.instance_url}{path}"
-        headers = await self.auth.get_headers()
-        headers["Accept"] = "application/json"
-        
-        if isinstance(self.auth, BasicAuth):
-            auth = self.auth.get_auth()
-        else:
-            auth = None
+        method = method.upper()
+        if method not in ALLOWED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        if method == "GET":
+            cache_key = self._cache_key(path, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.cache_stats["hits"] += 1
+                CACHE_REQUESTS.labels("client", "hit").inc()
+                return cached
+            self.cache_stats["misses"] += 1
+            CACHE_REQUESTS.labels("client", "miss").inc()
             
+            pending = self._pending_gets.get(cache_key)
+            if pending is None:
+                # The upstream call runs as its own task so it outlives any one caller
+                pending = asyncio.ensure_future(
+                    self._fetch(method, path, params, json_data, cache_key)
+                )
+                self._pending_gets[cache_key] = pending
+                pending.add_done_callback(
+                    lambda task: self._forget_pending_get(cache_key, task)
+                )
+            # Shielded so a cancelled caller does not cancel the call others are waiting on
+            return await asyncio.shield(pending)
+        
+        return await self._fetch(method, path, params, json_data, None)
+    
+    async def _fetch(self, method: str, path: str,
+                     params: Optional[Dict[str, Any]],
+                     json_data: Optional[Dict[str, Any]],
+                     cache_key: Optional[Tuple]) -> Dict[str, Any]:
+        """Call ServiceNow and update the caches, falling back to stale data for failed GETs"""
+        generation = self._generations.get(self._table_prefix(path), 0)
         try:
-            response = await self.client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-                headers=headers,
-                auth=auth
-            )
+            response = await self._send(method, path, params, json_data)
             response.raise_for_status()
-            return response.json()
+            result = orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             logger.error(f"ServiceNow API error: {e.response.text}")
+            stale = self._get_stale(cache_key) if e.response.status_code in RETRY_STATUSES else None
+            if stale is None:
+                raise
+            return stale
+        except (httpx.TransportError, CircuitOpenError, ServiceNowTimeoutError):
+            stale = self._get_stale(cache_key)
+            if stale is None:
+                raise
+            return stale
+        finally:
+            if cache_key is None:
+                self.invalidate_cache(path)
+        
+        if cache_key is not None:
+            self._store(cache_key, path, generation, result)
+        return result
+    
+    def _store(self, cache_key: Tuple, path: str, generation: int, result: Dict[str, Any]):
+        """Cache a GET result unless its table was written to since the GET started"""
+        if self._generations.get(self._table_prefix(path), 0) == generation:
+            self.cache[cache_key] = result
+            self.stale_cache[cache_key] = result
+    
+    def _forget_pending_get(self, cache_key: Tuple, task: asyncio.Future):
+        """Drop a finished upstream GET from the in-progress calls"""
+        if self._pending_gets.get(cache_key) is task:
+            del self._pending_gets[cache_key]
+        # Mark failures as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    @staticmethod
+    def _cache_key(path: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """Cache key for a GET, from its path and query parameters"""
+        return (path, tuple(sorted((params or {}).items())))
+    
+    def _get_stale(self, cache_key: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        """Get the last good response for a failed GET, if stale responses are allowed"""
+        if cache_key is None or not self.stale_if_error:
+            return None
+        stale = self.stale_cache.get(cache_key)
+        if stale is not None:
+            self.cache_stats["stale"] += 1
+            CACHE_REQUESTS.labels("client", "stale").inc()
+            logger.warning(f"ServiceNow request failed, serving stale response for {cache_key[0]}")
+        return stale
+    
+    async def _send(self, method: str, path: str,
+                    params: Optional[Dict[str, Any]],
+                    json_data: Optional[Dict[str, Any]]) -> httpx.Response:
+        """Send a request through the circuit breaker and concurrency limit, retrying transient failures"""
+        self.breaker.before_call()
+        
+        url = f"{self.instance_url}{path}"
+        headers = await self.auth.get_headers()
+        retryable = method in IDEMPOTENT_METHODS
+        latency = UPSTREAM_LATENCY.labels(method, endpoint_prefix(path))
+        if self._inflight is None:
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+        
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with self._inflight:
+                    with UPSTREAM_INFLIGHT.track_inprogress(), latency.time():
+                        response = await self.client.request(
+                            method=method,
+                            url=url,
+                            params=params,
+                            json=json_data,
+                            headers=headers
+                        )
+                if not retryable or attempt == self.max_retries or \
+                        response.status_code not in RETRY_STATUSES:
+                    break
+                logger.warning(f"ServiceNow returned {response.status_code} for {method} {path}, retrying")
+                await asyncio.sleep(self._retry_delay(response, attempt))
+        except httpx.TimeoutException as e:
+            self.breaker.record_failure()
+            raise ServiceNowTimeoutError(
+                f"{SERVICENOW_TIMEOUT}: ServiceNow did not respond to {method} {path} in time"
+            ) from e
+        except httpx.TransportError:
+            self.breaker.record_failure()
             raise
+        
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+    
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying, honouring a numeric Retry-After header"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+        return self.backoff_factor * (2 ** attempt)
+    
+    @staticmethod
+    def _table_prefix(path: str) -> str:
+        """Table path that a request path belongs to"""
+        # /api/now/table/{table}[/{sys_id}] -> /api/now/table/{table}
+        return "/".join(path.split("/")[:5])
+    
+    def invalidate_cache(self, path: str):
+        """Drop cached and in-flight responses for the table that the given path belongs to"""
+        prefix = self._table_prefix(path)
+        self._generations[prefix] = self._generations.get(prefix, 0) + 1
+        # In-flight GETs keep running for their callers, but later GETs start afresh
+        for cache in (self.cache, self.stale_cache, self._pending_gets):
+            for key in [k for k in cache.keys() if k[0] == prefix or k[0].startswith(prefix + "/")]:
+                cache.pop(key, None)
             
-    async def get_record(self, table: str, sys_id: str) -> Dict[str, Any]:
-        """Get a record by sys_id"""
+    async def get_record(self, table: str, sys_id: str,
+                         fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a record by sys_id, optionally limited to the given fields"""
         if table == "incident" and sys_id.startswith("INC"):
             # This is an incident number, not a sys_id
             logger.warning(f"Attempted to use get_record with incident number instead of sys_id: {sys_id}")
             logger.warning("Redirecting to get_incident_by_number method")
-            result = await self.get_incident_by_number(sys_id)
+            result = await self.get_incident_by_number(sys_id, fields)
             if result:
                 return {"result": result}
             else:
                 raise ValueError(f"Incident not found: {sys_id}")
-        return await self.request("GET", f"/api/now/table/{table}/{sys_id}")
+        
+        path = f"/api/now/table/{table}/{sys_id}"
+        params = {"sysparm_fields": ",".join(fields)} if fields else None
+        cache_key = self._cache_key(path, params)
+        
+        # Checked here so cached records skip the batcher altogether
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.cache_stats["hits"] += 1
+            CACHE_REQUESTS.labels("client", "hit").inc()
+            return cached
+        
+        generation = self._generations.get(self._table_prefix(path), 0)
+        record = await self.batcher.get((table, tuple(fields) if fields else None), sys_id)
+        if record is None:
+            # Not returned by the bulk query; look it up directly so the caller
+            # gets ServiceNow's own error for a missing or restricted record
+            return await self.request("GET", path, params=params)
+        
+        # Cache under the single-record key so repeat lookups hit the check above
+        result = {"result": record}
+        self._store(cache_key, path, generation, result)
+        return result
+    
+    async def _fetch_batch(self, group: Tuple[str, Optional[Tuple[str, ...]]],
+                           sys_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch a batch of get_record lookups collected by the batcher"""
+        table, fields = group
+        return await self.get_records_bulk(table, sys_ids, list(fields) if fields else None)
+    
+    async def get_records_bulk(self, table: str, sys_ids: List[str],
+                               fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get several records by sys_id in as few requests as possible, keyed by sys_id"""
+        sys_ids = list(dict.fromkeys(sys_ids))
+        if fields and "sys_id" not in fields:
+            fields = list(fields) + ["sys_id"]
+        
+        async def fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            params = {
+                "sysparm_query": f"sys_idIN{','.join(chunk)}",
+                "sysparm_limit": len(chunk)
+            }
+            if fields:
+                params["sysparm_fields"] = ",".join(fields)
+            result = await self.request("GET", f"/api/now/table/{table}", params=params)
+            return result.get("result", [])
+        
+        chunks = [sys_ids[i:i + BULK_CHUNK_SIZE] for i in range(0, len(sys_ids), BULK_CHUNK_SIZE)]
+        records = {}
+        for chunk_records in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+            for record in chunk_records:
+                records[record["sys_id"]] = record
+        return records
         
     async def get_records(self, table: str, options: QueryOptions = None) -> Dict[str, Any]:
         """Get records with query options"""
@@ -277,18 +556,24 @@ class ServiceNowClient:
         """Delete a record"""
         return await self.request("DELETE", f"/api/now/table/{table}/{sys_id}")
         
-    async def get_incident_by_number(self, number: str) -> Dict[str, Any]:
-        """Get an incident by its number"""
-        result = await self.request("GET", f"/api/now/table/incident", 
-                                  params={"sysparm_query": f"number={number}", "sysparm_limit": 1})
+    async def get_incident_by_number(self, number: str,
+                                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get an incident by its number, optionally limited to the given fields"""
+        params = {"sysparm_query": f"number={number}", "sysparm_limit": 1}
+        if fields:
+            params["sysparm_fields"] = ",".join(fields)
+        result = await self.request("GET", f"/api/now/table/incident", params=params)
         if result.get("result") and len(result["result"]) > 0:
             return result["result"][0]
         return None
         
-    async def search(self, query: str, table: str = "incident", limit: int = 10) -> Dict[str, Any]:
+    async def search(self, query: str, table: str = "incident", limit: int = 10,
+                     fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Search for records using text query"""
-        return await self.request("GET", f"/api/now/table/{table}", 
-                                params={"sysparm_query": f"123TEXTQUERY321={query}", "sysparm_limit": limit})
+        params = {"sysparm_query": f"123TEXTQUERY321={query}", "sysparm_limit": limit}
+        if fields:
+            params["sysparm_fields"] = ",".join(fields)
+        return await self.request("GET", f"/api/now/table/{table}", params=params)
                                 
     async def get_available_tables(self) -> List[str]:
         """Get a list of available tables"""
@@ -331,6 +616,7 @@ class ServiceNowMCP:
         self.mcp.resource("servicenow://tables")(self.get_tables)
         self.mcp.resource("servicenow://tables/{table}")(self.get_table_records)
         self.mcp.resource("servicenow://schema/{table}")(self.get_table_schema)
+        self.mcp.resource("servicenow://stats/cache")(self.get_cache_stats)
         
         # Register tools
         self.mcp.tool(name="create_incident")(self.create_incident)
@@ -364,9 +650,9 @@ class ServiceNowMCP:
     # Resource handlers
     async def list_incidents(self) -> str:
         """List recent incidents in ServiceNow"""
-        options = QueryOptions(limit=10)
+        options = QueryOptions(limit=10, fields=DEFAULT_INCIDENT_FIELDS)
         result = await self.client.get_records("incident", options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def get_incident(self, number: str) -> str:
         """Get a specific incident by number"""
@@ -374,10 +660,12 @@ class ServiceNowMCP:
             # Always use get_incident_by_number to query by incident number, not get_record
             incident = await self.client.get_incident_by_number(number)
             if incident:
-                return json.dumps({"result": incident}, indent=2)
+                return to_json({"result": incident})
             else:
                 logger.error(f"No incident found with number: {number}")
                 return json.dumps({"error":{"message":"No Record found","detail":"Record doesn't exist or ACL restricts the record retrieval"},"status":"failure"})
+        except (CircuitOpenError, ServiceNowTimeoutError):
+            raise
         except Exception as e:
             logger.error(f"Error getting incident {number}: {str(e)}")
             return json.dumps({"error":{"message":str(e),"detail":"Error occurred while retrieving the record"},"status":"failure"})
@@ -386,29 +674,37 @@ class ServiceNowMCP:
         """List users in ServiceNow"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records("sys_user", options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def list_knowledge(self) -> str:
         """List knowledge articles in ServiceNow"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records("kb_knowledge", options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
+        
+    async def get_cache_stats(self) -> str:
+        """Get hit, miss and stale counts for the ServiceNow response cache"""
+        return to_json({
+            **self.client.cache_stats,
+            "size": len(self.client.cache),
+            "stale_size": len(self.client.stale_cache)
+        })
         
     async def get_tables(self) -> str:
         """Get a list of available tables"""
         result = await self.client.get_available_tables()
-        return json.dumps({"result": result}, indent=2)
+        return to_json({"result": result})
         
     async def get_table_records(self, table: str) -> str:
         """Get records from a specific table"""
         options = QueryOptions(limit=10)
         result = await self.client.get_records(table, options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def get_table_schema(self, table: str) -> str:
         """Get the schema for a table"""
         result = await self.client.get_table_schema(table)
-        return json.dumps(result, indent=2)
+        return to_json(result)
     
     # Tool handlers
     async def create_incident(self, 
@@ -472,7 +768,10 @@ class ServiceNowMCP:
             if ctx:
                 await ctx.info(f"Created incident: {result['result']['number']}")
                 
-            return json.dumps(result, indent=2)
+            return to_json(result)
+        except (CircuitOpenError, ServiceNowTimeoutError):
+            # Let FastMCP report these as errors so the HTTP bridge can answer 503/504
+            raise
         except Exception as e:
             error_message = f"Error creating incident: {str(e)}"
             logger.error(error_message)
@@ -499,7 +798,7 @@ class ServiceNowMCP:
         if ctx:
             await ctx.info(f"Looking up incident: {number}")
             
-        incident = await self.client.get_incident_by_number(number)
+        incident = await self.client.get_incident_by_number(number, fields=["sys_id"])
         
         if not incident:
             error_message = f"Incident {number} not found"
@@ -516,12 +815,13 @@ class ServiceNowMCP:
         data = updates.dict(exclude_none=True)
         result = await self.client.update_record("incident", sys_id, data)
         
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def search_records(self, 
                     query: str, 
                     table: str = "incident",
                     limit: int = 10,
+                    fields: Optional[List[str]] = None,
                     ctx: Context = None) -> str:
         """
         Search for records in ServiceNow using text query
@@ -530,6 +830,7 @@ class ServiceNowMCP:
             query: Text to search for
             table: Table to search in
             limit: Maximum number of results to return
+            fields: List of fields to return (or all fields if None)
             ctx: Optional context object for progress reporting
             
         Returns:
@@ -538,12 +839,13 @@ class ServiceNowMCP:
         if ctx:
             await ctx.info(f"Searching {table} for: {query}")
             
-        result = await self.client.search(query, table, limit)
-        return json.dumps(result, indent=2)
+        result = await self.client.search(query, table, limit, fields)
+        return to_json(result)
         
     async def get_record(self,
                 table: str,
                 sys_id: str,
+                fields: Optional[List[str]] = None,
                 ctx: Context = None) -> str:
         """
         Get a specific record by sys_id
@@ -551,6 +853,7 @@ class ServiceNowMCP:
         Args:
             table: Table to query
             sys_id: System ID of the record
+            fields: List of fields to return (or all fields if None)
             ctx: Optional context object for progress reporting
             
         Returns:
@@ -559,8 +862,8 @@ class ServiceNowMCP:
         if ctx:
             await ctx.info(f"Getting {table} record: {sys_id}")
             
-        result = await self.client.get_record(table, sys_id)
-        return json.dumps(result, indent=2)
+        result = await self.client.get_record(table, sys_id, fields)
+        return to_json(result)
         
     async def perform_query(self,
                    table: str,
@@ -594,7 +897,7 @@ class ServiceNowMCP:
         )
         
         result = await self.client.get_records(table, options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def add_comment(self,
                  number: str,
@@ -614,7 +917,7 @@ class ServiceNowMCP:
         if ctx:
             await ctx.info(f"Adding comment to incident: {number}")
             
-        incident = await self.client.get_incident_by_number(number)
+        incident = await self.client.get_incident_by_number(number, fields=["sys_id"])
         
         if not incident:
             error_message = f"Incident {number} not found"
@@ -628,7 +931,7 @@ class ServiceNowMCP:
         update = {"comments": comment}
         result = await self.client.update_record("incident", sys_id, update)
         
-        return json.dumps(result, indent=2)
+        return to_json(result)
         
     async def add_work_notes(self,
                     number: str,
@@ -648,7 +951,7 @@ class ServiceNowMCP:
         if ctx:
             await ctx.info(f"Adding work notes to incident: {number}")
             
-        incident = await self.client.get_incident_by_number(number)
+        incident = await self.client.get_incident_by_number(number, fields=["sys_id"])
         
         if not incident:
             error_message = f"Incident {number} not found"
@@ -662,7 +965,7 @@ class ServiceNowMCP:
         update = {"work_notes": work_notes}
         result = await self.client.update_record("incident", sys_id, update)
         
-        return json.dumps(result, indent=2)
+        return to_json(result)
     
     # Natural language tools
     async def natural_language_search(self,
@@ -699,7 +1002,7 @@ class ServiceNowMCP:
         )
         
         result = await self.client.get_records(search_params['table'], options)
-        return json.dumps(result, indent=2)
+        return to_json(result)
     
     async def natural_language_update(self,
                               command: str,
@@ -731,7 +1034,7 @@ class ServiceNowMCP:
             
             # Get the record
             if record_number.startswith("INC"):
-                incident = await self.client.get_incident_by_number(record_number)
+                incident = await self.client.get_incident_by_number(record_number, fields=["sys_id"])
                 if not incident:
                     error_message = f"Incident {record_number} not found"
                     if ctx:
@@ -749,7 +1052,7 @@ class ServiceNowMCP:
             
             # Update the record
             result = await self.client.update_record(table, sys_id, updates)
-            return json.dumps(result, indent=2)
+            return to_json(result)
             
         except ValueError as e:
             error_message = str(e)
@@ -815,7 +1118,7 @@ class ServiceNowMCP:
                 
             result = await self.client.update_record(table, sys_id, data)
             
-        return json.dumps(result, indent=2)
+        return to_json(result)
     
     # Prompt templates
     def incident_analysis_prompt(self, incident_number: str) -> str:
@@ -0,0 +1,95 @@
+"""
+Tests for the single-process MCP HTTP app
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+import app
+from config import Config
+
+# Stand-in MCP server: replies to each request, except for a few methods
+# that misbehave on purpose
+FAKE_SERVER = textwrap.dedent("""
+    import json, sys
+    for line in sys.stdin:
+        message = json.loads(line)
+        method = message.get("method")
+        if "id" not in message or method == "hang":
+            continue
+        if method == "garbage":
+            print("Error: ServiceNow instance URL is required", flush=True)
+            continue
+        if method == "exit":
+            sys.exit(1)
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+""")
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client whose MCP server is the fake server above"""
+    server = tmp_path / "fake_server.py"
+    server.write_text(FAKE_SERVER)
+    monkeypatch.setattr(app, "MCP_COMMAND", [sys.executable, str(server)])
+    monkeypatch.setattr(Config, "REQUEST_TIMEOUT", 1)
+    yield app.app.test_client()
+    app.kill_mcp_proc()
+
+
+def call(client, method, request_id=1):
+    """POST a JSON-RPC request to /mcp"""
+    return client.post("/mcp", json={"jsonrpc": "2.0", "id": request_id, "method": method})
+
+
+class TestMCPEndpoint:
+    """Test cases for the shared MCP server process"""
+
+    def test_requests_share_one_process(self, client):
+        """Test that consecutive requests are answered by the same server"""
+        assert call(client, "ping", 1).get_json()["id"] == 1
+        pid = app.mcp_proc.pid
+        assert call(client, "ping", 2).get_json()["id"] == 2
+        assert app.mcp_proc.pid == pid
+
+    def test_exited_server_is_restarted(self, client):
+        """Test that a server that exits is replaced on the next request"""
+        assert call(client, "exit").status_code == 502
+        assert call(client, "ping", 2).get_json()["id"] == 2
+
+    def test_unresponsive_server_times_out(self, client):
+        """Test that a server that stops replying is killed and replaced"""
+        call(client, "ping")
+        proc = app.mcp_proc
+
+        response = call(client, "hang", 2)
+        assert response.status_code == 504
+        assert proc.poll() is not None
+        assert call(client, "ping", 3).get_json()["id"] == 3
+
+    def test_non_json_output_returns_502(self, client):
+        """Test that stray server output is not reported as a bad client body"""
+        response = call(client, "garbage")
+        assert response.status_code == 502
+        assert "invalid output" in response.get_json()["error"]
+        assert call(client, "ping", 2).get_json()["id"] == 2
+
+    def test_invalid_body_returns_400(self, client):
+        """Test that a malformed client body is rejected"""
+        response = client.post("/mcp", data=b"{bad", content_type="application/json")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "invalid json"}
+
+    @pytest.mark.parametrize("body", [b"", b"[1]", b"null"])
+    def test_empty_or_non_object_body_returns_400(self, client, body):
+        """Test that bodies that are not JSON-RPC objects never reach the server"""
+        response = client.post("/mcp", data=body, content_type="application/json")
+        assert response.status_code == 400
+        assert app.mcp_proc is None
+
+    def test_notification_is_accepted(self, client):
+        """Test that a notification gets a 202 without waiting for a reply"""
+        response = client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+        assert response.status_code == 202
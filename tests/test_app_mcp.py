@@ -0,0 +1,200 @@
+"""
+Tests for the HTTP bridge
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import app_mcp
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the bridge's table streamer to a mock ServiceNow, recording each request"""
+    monkeypatch.setenv("SERVICENOW_INSTANCE_URL", "https://example.service-now.com")
+    monkeypatch.setenv("SERVICENOW_USERNAME", "user")
+    monkeypatch.setenv("SERVICENOW_PASSWORD", "pass")
+
+    requests = []
+    responses = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    streamer = app_mcp.TableStreamer(max_inflight=2, backoff_factor=0)
+    streamer.client._transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(app_mcp, "get_streamer", lambda: streamer)
+    return streamer, requests, responses
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the bridge"""
+    return app_mcp.app.test_client()
+
+
+class TestQueryTable:
+    """Test cases for the /mcp/table/<table> route"""
+
+    def test_streams_records(self, upstream, client):
+        """Test that ServiceNow's body is relayed and the connection slot freed"""
+        streamer, requests, responses = upstream
+        responses.append(httpx.Response(200, json={"result": [{"number": "INC0010001"}]}))
+
+        response = client.get("/mcp/table/incident?query=active=true&limit=5&fields=number")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.get_json() == {"result": [{"number": "INC0010001"}]}
+        params = requests[0].url.params
+        assert params["sysparm_query"] == "active=true"
+        assert params["sysparm_limit"] == "5"
+        assert params["sysparm_fields"] == "number"
+        response.close()
+        # Both slots are free again
+        assert streamer.inflight.acquire(blocking=False)
+        assert streamer.inflight.acquire(blocking=False)
+
+    def test_rejects_limit_over_cap(self, upstream, client):
+        """Test that an oversized limit is rejected without calling ServiceNow"""
+        _, requests, _ = upstream
+        response = client.get(f"/mcp/table/incident?limit={app_mcp.MAX_STREAM_LIMIT + 1}")
+        assert response.status_code == 400
+        assert requests == []
+
+    def test_open_circuit_returns_503(self, upstream, client):
+        """Test that an open circuit is reported without calling ServiceNow"""
+        streamer, requests, _ = upstream
+        for _ in range(streamer.breaker.fail_max):
+            streamer.breaker.record_failure()
+
+        response = client.get("/mcp/table/incident")
+        assert response.status_code == 503
+        assert requests == []
+
+    def test_retries_transient_errors(self, upstream, client):
+        """Test that a 503 from ServiceNow is retried before streaming"""
+        _, requests, responses = upstream
+        responses.extend([httpx.Response(503), httpx.Response(200, json={"result": []})])
+
+        response = client.get("/mcp/table/incident")
+        assert response.status_code == 200
+        assert response.get_json() == {"result": []}
+        assert len(requests) == 2
+
+    def test_rejected_credentials_return_502(self, upstream, client):
+        """Test that ServiceNow rejecting the bridge's credentials is not passed on as a 401"""
+        _, _, responses = upstream
+        responses.append(httpx.Response(401, json={"error": {"message": "User Not Authenticated"}}))
+
+        response = client.get("/mcp/table/incident")
+        assert response.status_code == 502
+        assert "credentials" in response.get_json()["error"]
+
+    def test_non_json_response_returns_502(self, upstream, client):
+        """Test that a non-JSON body from ServiceNow is not relayed as JSON"""
+        _, _, responses = upstream
+        responses.append(httpx.Response(200, text="<html>Instance hibernating</html>",
+                                        headers={"Content-Type": "text/html"}))
+
+        response = client.get("/mcp/table/incident")
+        assert response.status_code == 502
+
+
+class TestRequestBodies:
+    """Test cases for JSON request body validation"""
+
+    @pytest.mark.parametrize("path", ["/mcp", "/mcp/tool/get_record?fields=number"])
+    def test_rejects_malformed_json(self, client, path):
+        """Test that a body that is not valid JSON is rejected"""
+        response = client.post(path, data=b"{bad", content_type="application/json")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "invalid json"}
+
+    @pytest.mark.parametrize("path", ["/mcp", "/mcp/tool/get_record?fields=number"])
+    def test_rejects_non_object_json(self, client, path):
+        """Test that valid JSON that is not an object is rejected"""
+        response = client.post(path, data=b"[1]", content_type="application/json")
+        assert response.status_code == 400
+
+
+class TestGetBridge:
+    """Test cases for get_bridge"""
+
+    def test_concurrent_first_calls_build_one_bridge(self, monkeypatch):
+        """Test that requests racing to create the bridge all get the same one"""
+        built = []
+
+        class SlowBridge:
+            def __init__(self):
+                time.sleep(0.01)
+                built.append(self)
+
+        monkeypatch.setattr(app_mcp, "MCPBridge", SlowBridge)
+        monkeypatch.setattr(app_mcp, "mcp_bridge", None)
+
+        barrier = threading.Barrier(8)
+        bridges = []
+
+        def call():
+            barrier.wait()
+            bridges.append(app_mcp.get_bridge())
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(built) == 1
+        assert all(bridge is built[0] for bridge in bridges)
+
+
+class TestListings:
+    """Test cases for the cached tool and resource listings"""
+
+    @pytest.fixture
+    def listing(self, monkeypatch):
+        """Serve listings from a fake bridge; returns the dict holding the current result"""
+        current = {"result": {"tools": [{"name": "create_incident"}]}}
+
+        class FakeBridge:
+            async def call_mcp_server(self, method, params):
+                return current["result"]
+
+        monkeypatch.setattr(app_mcp, "mcp_available", lambda: True)
+        monkeypatch.setattr(app_mcp, "get_bridge", lambda: FakeBridge())
+        monkeypatch.setattr(app_mcp, "run_async", asyncio.run)
+        monkeypatch.setattr(app_mcp, "listing_bodies", {})
+        return current
+
+    def test_listing_is_cacheable(self, listing, client):
+        """Test that a listing carries an ETag and a max-age"""
+        response = client.get("/mcp/tools")
+        assert response.status_code == 200
+        assert response.get_json() == {"tools": [{"name": "create_incident"}]}
+        assert response.headers["ETag"]
+        assert response.cache_control.max_age == app_mcp.LISTING_MAX_AGE == 300
+
+    def test_matching_etag_returns_304(self, listing, client):
+        """Test that a client holding the current listing gets 304 Not Modified"""
+        etag = client.get("/mcp/tools").headers["ETag"]
+
+        response = client.get("/mcp/tools", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_changed_listing_gets_new_etag(self, listing, client):
+        """Test that a new listing is re-serialized with a new ETag"""
+        etag = client.get("/mcp/tools").headers["ETag"]
+        listing["result"] = {"tools": []}
+
+        response = client.get("/mcp/tools", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json() == {"tools": []}
+        assert response.headers["ETag"] != etag
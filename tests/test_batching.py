@@ -0,0 +1,102 @@
+"""
+Tests for the request batching module
+"""
+
+import asyncio
+
+import pytest
+from mcp_server_servicenow.batching import RequestBatcher
+
+
+class TestRequestBatcher:
+    """Test cases for the RequestBatcher class"""
+
+    def test_concurrent_lookups_share_one_fetch(self):
+        """Test that concurrent lookups in a group are fetched together"""
+        calls = []
+
+        async def fetch(group, ids):
+            calls.append((group, sorted(ids)))
+            return {i: {"sys_id": i} for i in ids if i != "missing"}
+
+        async def run():
+            batcher = RequestBatcher(fetch, max_batch_size=10, max_delay=0.01)
+            return await asyncio.gather(
+                batcher.get("incident", "a"),
+                batcher.get("incident", "b"),
+                batcher.get("incident", "a"),
+                batcher.get("incident", "missing"),
+                batcher.get("sys_user", "c"),
+            )
+
+        results = asyncio.run(run())
+        assert results == [{"sys_id": "a"}, {"sys_id": "b"}, {"sys_id": "a"}, None, {"sys_id": "c"}]
+        assert sorted(calls) == [("incident", ["a", "b", "missing"]), ("sys_user", ["c"])]
+
+    def test_full_batch_dispatches_immediately(self):
+        """Test that reaching the batch size does not wait for the delay"""
+        calls = []
+
+        async def fetch(group, ids):
+            calls.append(len(ids))
+            return {i: i for i in ids}
+
+        async def run():
+            batcher = RequestBatcher(fetch, max_batch_size=2, max_delay=60)
+            return await asyncio.wait_for(
+                asyncio.gather(batcher.get("t", "a"), batcher.get("t", "b")), timeout=1
+            )
+
+        assert asyncio.run(run()) == ["a", "b"]
+        assert calls == [2]
+
+    def test_lone_lookup_is_not_delayed(self):
+        """Test that a lookup with no batch in flight does not wait for the delay"""
+
+        async def fetch(group, ids):
+            return {i: i for i in ids}
+
+        async def run():
+            batcher = RequestBatcher(fetch, max_batch_size=10, max_delay=60)
+            return await asyncio.wait_for(batcher.get("t", "a"), timeout=1)
+
+        assert asyncio.run(run()) == "a"
+
+    def test_lookups_wait_while_a_batch_is_in_flight(self):
+        """Test that lookups arriving during a fetch are collected into the next batch"""
+        calls = []
+        release = None
+
+        async def fetch(group, ids):
+            calls.append(sorted(ids))
+            await release.wait()
+            return {i: i for i in ids}
+
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            batcher = RequestBatcher(fetch, max_batch_size=10, max_delay=0.05)
+            first = asyncio.ensure_future(batcher.get("t", "a"))
+            await asyncio.sleep(0)
+            later = [asyncio.ensure_future(batcher.get("t", i)) for i in ("b", "c")]
+            await asyncio.sleep(0.01)
+            release.set()
+            return await asyncio.gather(first, *later)
+
+        assert asyncio.run(run()) == ["a", "b", "c"]
+        assert calls == [["a"], ["b", "c"]]
+
+    def test_fetch_error_reaches_every_waiter(self):
+        """Test that a failed fetch fails every lookup in the batch"""
+
+        async def fetch(group, ids):
+            raise RuntimeError("ServiceNow unavailable")
+
+        async def run():
+            batcher = RequestBatcher(fetch, max_delay=0.01)
+            return await asyncio.gather(
+                batcher.get("t", "a"), batcher.get("t", "b"), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
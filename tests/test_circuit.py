@@ -0,0 +1,59 @@
+"""
+Tests for the circuit breaker module
+"""
+
+import pytest
+from mcp_server_servicenow.circuit import CircuitBreaker, CircuitOpenError, SERVICENOW_UNAVAILABLE
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test cases for the CircuitBreaker class"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens once fail_max is reached"""
+        breaker = CircuitBreaker(fail_max=3, reset_timeout=30, clock=FakeClock())
+        for _ in range(2):
+            breaker.record_failure()
+            breaker.before_call()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError, match=SERVICENOW_UNAVAILABLE):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        """Test that a success in between failures keeps the circuit closed"""
+        breaker = CircuitBreaker(fail_max=2, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_half_open_after_timeout(self):
+        """Test that calls resume after the timeout and a failure re-opens the circuit"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 31
+        assert breaker.state == "half-open"
+        breaker.before_call()
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now = 62
+        breaker.record_success()
+        assert breaker.state == "closed"
@@ -0,0 +1,263 @@
+"""
+Tests for the ServiceNow client's request handling
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp_server_servicenow.server import (
+    MAX_RETRY_AFTER, RETRY_STATUSES, ServiceNowClient, create_basic_auth
+)
+
+
+def make_client(handler, **kwargs):
+    """ServiceNow client whose requests are answered by handler"""
+    kwargs.setdefault("max_retries", 0)
+    client = ServiceNowClient(
+        "https://example.service-now.com", create_basic_auth("user", "pass"), **kwargs
+    )
+    client.client._transport = httpx.MockTransport(handler)
+    return client
+
+
+class Upstream:
+    """Mock ServiceNow that records requests and answers with a queue of statuses"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.requests = []
+        self.statuses = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        return httpx.Response(status, json={"result": {"n": len(self.requests)}})
+
+
+class TestServiceNowClient:
+    """Test cases for ServiceNowClient.request"""
+
+    def test_repeat_get_is_cached(self):
+        """Test that a repeated GET is served from the cache"""
+        upstream = Upstream()
+
+        async def run():
+            client = make_client(upstream)
+            first = await client.request("GET", "/api/now/table/incident", {"a": 1})
+            second = await client.request("get", "/api/now/table/incident", {"a": 1})
+            return client, first, second
+
+        client, first, second = asyncio.run(run())
+        assert first == second == {"result": {"n": 1}}
+        assert len(upstream.requests) == 1
+        assert client.cache_stats["hits"] == 1
+
+    def test_write_invalidates_table(self):
+        """Test that a write clears cached GETs for the same table"""
+        upstream = Upstream()
+
+        async def run():
+            client = make_client(upstream)
+            await client.request("GET", "/api/now/table/incident")
+            await client.request("PATCH", "/api/now/table/incident/abc", json_data={"state": "2"})
+            return await client.request("GET", "/api/now/table/incident")
+
+        assert asyncio.run(run()) == {"result": {"n": 3}}
+        assert len(upstream.requests) == 3
+
+    def test_concurrent_calls_are_capped(self):
+        """Test that no more than max_inflight calls reach ServiceNow at once"""
+        upstream = Upstream(delay=0.01)
+
+        async def run():
+            client = make_client(upstream, max_inflight=3)
+            await asyncio.gather(*[
+                client.request("GET", "/api/now/table/incident", {"n": i}) for i in range(10)
+            ])
+
+        asyncio.run(run())
+        assert len(upstream.requests) == 10
+        assert upstream.max_active == 3
+
+    def test_stale_response_served_on_error(self):
+        """Test that the last good response is served when ServiceNow fails"""
+        upstream = Upstream()
+        upstream.statuses = [200, 503]
+
+        async def run():
+            client = make_client(upstream, cache_ttl=0.01)
+            good = await client.request("GET", "/api/now/table/incident")
+            await asyncio.sleep(0.02)
+            stale = await client.request("GET", "/api/now/table/incident")
+            return client, good, stale
+
+        client, good, stale = asyncio.run(run())
+        assert stale == good
+        assert client.cache_stats["stale"] == 1
+
+    def test_stale_response_expires(self):
+        """Test that a response older than stale_ttl is not served"""
+        upstream = Upstream()
+        upstream.statuses = [200, 503]
+
+        async def run():
+            client = make_client(upstream, cache_ttl=0.01, stale_ttl=0.01)
+            await client.request("GET", "/api/now/table/incident")
+            await asyncio.sleep(0.02)
+            await client.request("GET", "/api/now/table/incident")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_concurrent_gets_are_coalesced(self):
+        """Test that identical concurrent GETs share one upstream call"""
+        upstream = Upstream(delay=0.02)
+
+        async def run():
+            client = make_client(upstream)
+            results = await asyncio.gather(*[
+                client.request("GET", "/api/now/table/incident") for _ in range(10)
+            ])
+            return client, results
+
+        client, results = asyncio.run(run())
+        assert all(r == {"result": {"n": 1}} for r in results)
+        assert len(upstream.requests) == 1
+        assert client._pending_gets == {}
+
+    def test_cancelled_caller_does_not_cancel_followers(self):
+        """Test that cancelling the first caller leaves the shared call running for others"""
+        upstream = Upstream(delay=0.05)
+
+        async def run():
+            client = make_client(upstream)
+            leader = asyncio.ensure_future(client.request("GET", "/api/now/table/incident"))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(client.request("GET", "/api/now/table/incident"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return leader, await follower
+
+        leader, result = asyncio.run(run())
+        assert leader.cancelled()
+        assert result == {"result": {"n": 1}}
+        assert len(upstream.requests) == 1
+
+    def test_write_evicts_in_flight_get(self):
+        """Test that a GET after a write does not reuse or cache a read started before it"""
+        state = {"value": "old"}
+
+        async def handler(request):
+            if request.method == "GET":
+                value = state["value"]
+                await asyncio.sleep(0.05)
+                return httpx.Response(200, json={"result": {"state": value}})
+            state["value"] = "new"
+            return httpx.Response(200, json={"result": {}})
+
+        async def run():
+            client = make_client(handler)
+            before = asyncio.ensure_future(client.request("GET", "/api/now/table/incident/abc"))
+            await asyncio.sleep(0.01)
+            await client.request("PUT", "/api/now/table/incident/abc", json_data={"state": "new"})
+            after = await client.request("GET", "/api/now/table/incident/abc")
+            await before
+            cached = await client.request("GET", "/api/now/table/incident/abc")
+            return await before, after, cached
+
+        before, after, cached = asyncio.run(run())
+        assert before == {"result": {"state": "old"}}
+        assert after == cached == {"result": {"state": "new"}}
+
+
+class TestRetries:
+    """Test cases for retrying transient ServiceNow failures"""
+
+    @pytest.mark.parametrize("status", sorted(RETRY_STATUSES))
+    def test_transient_status_is_retried(self, status):
+        """Test that a GET failing with a transient status is retried"""
+        upstream = Upstream()
+        upstream.statuses = [status]
+
+        async def run():
+            client = make_client(upstream, max_retries=2, backoff_factor=0)
+            return client, await client.request("GET", "/api/now/table/incident")
+
+        client, result = asyncio.run(run())
+        assert result == {"result": {"n": 2}}
+        assert len(upstream.requests) == 2
+        assert client.breaker.failures == 0
+
+    def test_client_error_is_not_retried(self):
+        """Test that a 404 is returned straight away"""
+        upstream = Upstream()
+        upstream.statuses = [404]
+
+        async def run():
+            client = make_client(upstream, max_retries=2, backoff_factor=0)
+            await client.request("GET", "/api/now/table/incident/missing")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH"])
+    def test_non_idempotent_methods_are_not_retried(self, method):
+        """Test that a write that may have been applied is not sent twice"""
+        upstream = Upstream()
+        upstream.statuses = [503]
+
+        async def run():
+            client = make_client(upstream, max_retries=2, backoff_factor=0)
+            await client.request(method, "/api/now/table/incident", json_data={})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert len(upstream.requests) == 1
+
+    def test_exhausted_retries_count_as_one_breaker_failure(self):
+        """Test that a request that keeps failing is recorded once by the circuit breaker"""
+        upstream = Upstream()
+        upstream.statuses = [503, 503, 503]
+
+        async def run():
+            client = make_client(upstream, max_retries=2, backoff_factor=0)
+            try:
+                await client.request("GET", "/api/now/table/incident")
+            except httpx.HTTPStatusError:
+                pass
+            return client
+
+        client = asyncio.run(run())
+        assert len(upstream.requests) == 3
+        assert client.breaker.failures == 1
+
+    def test_transport_error_counts_as_breaker_failure(self):
+        """Test that a connection failure is recorded by the circuit breaker"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client = make_client(handler)
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(client.request("GET", "/api/now/table/incident"))
+        assert client.breaker.failures == 1
+
+    @pytest.mark.parametrize("headers, attempt, expected", [
+        ({"Retry-After": "2"}, 0, 2),
+        ({"Retry-After": "3600"}, 0, MAX_RETRY_AFTER),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 1, 1.0),
+        ({}, 2, 2.0),
+    ])
+    def test_retry_delay(self, headers, attempt, expected):
+        """Test that Retry-After is honoured up to a cap, with exponential backoff otherwise"""
+        client = make_client(Upstream(), backoff_factor=0.5)
+        assert client._retry_delay(httpx.Response(503, headers=headers), attempt) == expected
@@ -0,0 +1,18 @@
+"""
+Tests for the metrics module
+"""
+
+from mcp_server_servicenow.metrics import endpoint_prefix
+
+
+class TestEndpointPrefix:
+    """Test cases for the endpoint_prefix function"""
+
+    def test_table_paths_keep_table_name(self):
+        """Test that record ids are dropped from table API paths"""
+        assert endpoint_prefix("/api/now/table/incident") == "table/incident"
+        assert endpoint_prefix("/api/now/table/incident/abc123") == "table/incident"
+
+    def test_other_paths(self):
+        """Test that paths outside /api/now are kept as-is"""
+        assert endpoint_prefix("/oauth_token.do") == "oauth_token.do"
@@ -0,0 +1,57 @@
+"""
+Tests for the ServiceNow MCP server
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp_server_servicenow.circuit import CircuitOpenError
+from mcp_server_servicenow.errors import (
+    SERVICENOW_TIMEOUT, SERVICENOW_UNAVAILABLE, ServiceNowTimeoutError
+)
+from mcp_server_servicenow.server import ServiceNowMCP, create_basic_auth
+
+
+@pytest.fixture
+def slow_server():
+    """Server whose ServiceNow instance never responds in time"""
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    server = ServiceNowMCP("https://example.service-now.com", create_basic_auth("user", "pass"))
+    server.client.client._transport = httpx.MockTransport(handler)
+    return server
+
+
+@pytest.fixture
+def server():
+    """Server whose circuit breaker is open"""
+    server = ServiceNowMCP("https://example.service-now.com", create_basic_auth("user", "pass"))
+    for _ in range(server.client.breaker.fail_max):
+        server.client.breaker.record_failure()
+    return server
+
+
+class TestServiceNowMCP:
+    """Test cases for the ServiceNowMCP class"""
+
+    def test_create_incident_reports_open_circuit(self, server):
+        """Test that create_incident raises, rather than returns, the open-circuit error"""
+        with pytest.raises(CircuitOpenError, match=SERVICENOW_UNAVAILABLE):
+            asyncio.run(server.create_incident("Email is down"))
+
+    def test_get_incident_reports_open_circuit(self, server):
+        """Test that the incident resource fails while the circuit is open"""
+        with pytest.raises(CircuitOpenError, match=SERVICENOW_UNAVAILABLE):
+            asyncio.run(server.get_incident("INC0010001"))
+
+    def test_create_incident_reports_timeout(self, slow_server):
+        """Test that create_incident raises, rather than returns, a ServiceNow timeout"""
+        with pytest.raises(ServiceNowTimeoutError, match=SERVICENOW_TIMEOUT):
+            asyncio.run(slow_server.create_incident("Email is down"))
+
+    def test_get_incident_reports_timeout(self, slow_server):
+        """Test that the incident resource raises a ServiceNow timeout"""
+        with pytest.raises(ServiceNowTimeoutError, match=SERVICENOW_TIMEOUT):
+            asyncio.run(slow_server.get_incident("INC0010001"))